@@ -4,8 +4,16 @@
 import datetime
 import unittest
 
+import numpy
+
+import tmgpm
 from tmgpm import Tmgpm
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 
 class TestTmgpmDefaultConstructor(unittest.TestCase):
 
@@ -70,6 +78,49 @@ class TestTmgpmGetStationList(unittest.TestCase):
         self.assertTrue('BREST' in station_list)
 
 
+class TestTmgpmSetStation(unittest.TestCase):
+
+    def test_unknown_station(self):
+        # check that an unknown station name is refused
+        self.assertRaises(ValueError, Tmgpm, 'NOWHERE')
+
+    def test_harmonic_data_is_shared(self):
+        # check that harmonic data is computed once and shared by all the
+        # objects for the same station
+        tide1 = Tmgpm('CONCARNEAU', 2014, 1, 1)
+        tide2 = Tmgpm('CONCARNEAU', 2015, 6, 1)
+        self.assertIs(tide1.A, tide2.A)
+        self.assertIs(tide1.G, tide2.G)
+        self.assertFalse(tide1.A.flags.writeable)
+
+
+class TestTmgpmPrecalc(unittest.TestCase):
+
+    def test_consecutive_days_share_precalc(self):
+        # check that 24:00 on a day and 00:00 on the next day are only
+        # computed once
+        tide1 = Tmgpm('BREST', 2014, 1, 31)
+        tide2 = Tmgpm('BREST', 2014, 2, 1)
+        self.assertIs(tide1.R24, tide2.R0)
+        self.assertIs(tide1.phi24, tide2.phi0)
+
+    def test_species_indexing(self):
+        # check that amplitudes and phases are indexed by species number,
+        # the unused species 3 being zero
+        tide = Tmgpm('BREST', 2014, 1, 1)
+        self.assertEqual(len(tide.R0), 5)
+        self.assertEqual(tide.R0[3], 0)
+        self.assertEqual(tide.phi24[3], 0)
+        self.assertEqual(tide.A.shape, (5, 11))
+        self.assertEqual(tide.G.shape, (5, 11))
+        self.assertFalse(tide.A[3].any())
+        self.assertEqual(tide.A[4][0], 19.0)  # BREST AMN4
+        self.assertEqual(tide.G[4][0], 117.0)  # BREST GMN4
+        self.assertEqual(len(Tmgpm.n1), 5)
+        self.assertEqual(Tmgpm.n1[3], [0] * 11)
+        self.assertEqual(Tmgpm.n1[1][1] * 1000, -2000)
+
+
 class TestTmgpmHarmonicConstituents(unittest.TestCase):
 
     def test_concarneau_1982(self):
@@ -78,6 +129,31 @@ class TestTmgpmHarmonicConstituents(unittest.TestCase):
         tide = Tmgpm('CONCARNEAU', 1982, 1, 1)
         self.assertEqual(int(tide.height(0)), 2302)
 
+    def test_height_curve(self):
+        # Check that heights computed over an array of times match
+        # the heights computed one at a time
+        tide = Tmgpm('CONCARNEAU', 1982, 1, 1)
+        times = [i / 4.0 for i in range(97)]
+        self.assertEqual(list(tide.height(times)), [tide.height(t) for t in times])
+
+    @unittest.skipIf(numba is None, "numba is not installed")
+    def test_parallel_height_curve(self):
+        # Check that the parallel ufunc used for long tide curves gives the
+        # same heights as the regular kernel
+        tide = Tmgpm('CONCARNEAU', 1982, 1, 1)
+        times = numpy.linspace(0, 24, 60001)
+        args = (tide.Z0, tide._R0, tide._dR, tide._phi0_rad, tide._omega_rad)
+        ufunc = tmgpm._build_parallel_height_kernel()
+        numpy.testing.assert_allclose(ufunc(times, *args), tmgpm._height_curve(times, *args), rtol=0, atol=1e-6)
+
+    def test_height_scalar_array(self):
+        # Check that a 0-d array of time gives the same integer height as
+        # a plain float
+        tide = Tmgpm('CONCARNEAU', 1982, 1, 1)
+        height = tide.height(numpy.array(9.5))
+        self.assertTrue(isinstance(height, int))
+        self.assertEqual(height, tide.height(9.5))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -11,33 +11,197 @@ __email__ = "hleroy@hleroy.com"
 
 import csv
 import datetime
-from math import cos, acos, sin, asin, degrees, radians, floor, sqrt, pow as power, copysign
+import functools
+from math import cos, sin
 import os
 
-
-def sign(x):
-    return copysign(1, x)
+import numpy as np
+
+# Harmonic species j used by the calculations, species 3 being reserved and unused
+_J = np.array([0, 1, 2, 4])
+
+# Constants initialization: coefficients n1..n6 of the astronomical arguments s, h, p, N, p1 and D in the V_ij,
+# for each species of _J
+_N = np.array([
+    [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, -2, -3, 0, -2, 0, 0, 0, 0, 0, 0], [-2, -3, 0, -4, -4, -3, -1, 0, 0, -2, 0], [-5, -4, -2, 0, 0, 0, 0, 0, 0, 0, 0]],  # n1
+    [[1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [1, 1, 1, -1, 1, 1, 0, 0, 0, 0, 0], [2, 2, 0, 2, 4, 4, 2, 2, -1, 2, 2], [4, 4, 2, 0, 0, 0, 0, 0, 0, 0, 0]],  # n2
+    [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0], [0, 1, 0, 2, 0, -1, -1, 0, 0, 0, 0], [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]],  # n3
+    [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, -1, 1, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 1], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]],  # n4
+    [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]],  # n5
+    [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [1, -1, -1, 1, -1, 1, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]],  # n6
+], dtype=np.int8)
+
+# Day numbers T count the days since 1st January 1980
+_EPOCH = datetime.date(1980, 1, 1).toordinal()
+
+# Astronomical arguments s, h, p, N, p1 and D at T = 0, and their daily rates (converted from degrees to radians)
+_ASTRO_0 = np.radians([78.16, 279.82, 349.5, 208.1, 282.6, 90])
+_ASTRO_RATES = np.radians([13.17639673, 0.98564734, 0.11140408, 0.05295392, 0.000047069, 0])
+
+# Position of the e^(i * n * a) factor of each (k, j, i) coefficient of _N in the flattened (6, 11) table of the
+# multiples n = -5..5 of the astronomical arguments a
+_E_IDX = (11 * np.arange(6)[:, np.newaxis, np.newaxis] + _N.astype(np.intp) + 5).ravel()
+
+# Harmonic constituents of the stations data. Each (j, i) slot of the A and G arrays (one row per species of _J) is
+# derived from the constituent _SRC[j, i] (_SRC == 10 for unused slots), its amplitude being scaled by
+# _A_COEFFS[j, i] and its phase shifted by _G_OFFSET[j, i] (in degrees)
+_CONSTITUENTS = ('Sa', 'K1', 'O1', 'Q1', 'M2', 'N2', 'S2', 'MN4', 'M4', 'MS4')
+_SRC = np.array([[0, 10, 10, 10, 10, 10, 10, 10, 10, 10, 10], [1, 2, 3, 1, 2, 1, 10, 10, 10, 10, 10], [4, 5, 6, 5, 5, 5, 4, 6, 6, 4, 6], [7, 8, 9, 10, 10, 10, 10, 10, 10, 10, 10]])
+_A_COEFFS = np.array([[1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [1, 1, 1, -1 / 3.0, 1 / 5.3, 1 / 7.4, 0, 0, 0, 0, 0], [1, 1, 1, 1 / 7.6, 1 / 6.3, 1 / 5.3, -1 / 35.0, 1 / 3.7, 1 / 17.0, -1 / 27.0, 1 / 12.0], [1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0]])
+_G_OFFSET = np.array([[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, -283, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]], dtype=np.float64)
+
+
+def _compute_R_phi(astro, C, E_IDX):
+    """Compute amplitude and phase of each harmonic species
+
+    Args:
+      astro -- astronomical arguments s, h, p, N, p1 and D (in radians)
+      C -- harmonic coefficients A * exp(-iG) of the station
+      E_IDX -- position of the e^(i * n * a) factors of the V_ij arguments in the table of multiples
+    """
+    # cos(n * a) and sin(n * a) of each argument for n = -5..5, using the Chebyshev recurrence
+    # cos((n + 1) * a) = 2 * cos(a) * cos(n * a) - cos((n - 1) * a), and likewise for sin
+    E = np.empty((6, 11), dtype=np.complex128)
+    for k in range(6):
+        c1 = cos(astro[k])
+        s1 = sin(astro[k])
+        c_prev, s_prev, c, s = 1.0, 0.0, c1, s1
+        E[k, 5] = 1
+        for n in range(1, 6):
+            E[k, 5 + n] = complex(c, s)
+            E[k, 5 - n] = complex(c, -s)
+            c, c_prev = 2 * c1 * c - c_prev, c
+            s, s_prev = 2 * c1 * s - s_prev, s
+
+    # e^(i * V_ij) as the product of the e^(i * n * a) factors of its arguments (sum of angles identity)
+    F = E.ravel()[E_IDX].reshape(6, C.shape[0], C.shape[1])
+    Z = (C * F[0] * F[1] * F[2] * F[3] * F[4] * F[5]).sum(axis=1)
+    X = Z.real
+    Y = Z.imag
+
+    R = np.hypot(X, Y)
+    phi = np.degrees(np.arctan2(Y, X))
+
+    return R, phi
+
+
+def _height_curve(t, Z0, R0, dR, phi0, omega):
+    """Compute tide heights (in millimeters) at times t (in hours)
+
+    Args:
+      t -- times, as a 1D array
+      Z0 -- station Z0 value (in centimeters)
+      R0 -- amplitude of each harmonic species at 00:00
+      phi0 -- phase (in radians) of each harmonic species at 00:00
+      dR, omega -- hourly rates of change of the amplitude and phase of each harmonic species
+    """
+    # Z0 is stored in cm and the tide calculations are done in millimeters,
+    # hence the * 10
+    height = np.full(t.shape[0], Z0 * 10)
+    for j in range(R0.shape[0]):
+        height += (R0[j] + t * dR[j]) * np.cos(phi0[j] + t * omega[j])
+    return height
+
+
+# Use the ahead-of-time compiled kernels if they have been built (see tmgpm_aot.py), which saves importing numba and
+# JIT compiling on first call. Otherwise JIT compile the kernels with numba, or run them as plain Python if numba is
+# not installed
+try:
+    from tmgpm_native import compute_rphi as _rphi_kernel, height_curve as _height_kernel
+except ImportError:
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional
+        _rphi_kernel, _height_kernel = _compute_R_phi, _height_curve
+    else:
+        _rphi_kernel = njit(cache=True, fastmath=True)(_compute_R_phi)
+        _height_kernel = njit(cache=True, fastmath=True)(_height_curve)
+
+
+def _height_at(t, Z0, R0, dR, phi0, omega, height):
+    """Compute the tide height (in millimeters) at time t (in hours), as the core of the parallel ufunc"""
+    h = Z0 * 10
+    for j in range(R0.shape[0]):
+        h += (R0[j] + t * dR[j]) * cos(phi0[j] + t * omega[j])
+    height[0] = h
+
+
+# Minimum number of times for which tide curves are computed with the parallel ufunc. This threshold is a guess: the
+# startup cost of the thread pool, which offsets the gain of several threads, has not been measured on several cores
+_PARALLEL_MIN_SIZE = 50000
+
+
+def _build_parallel_height_kernel():
+    """Compile and return the parallel ufunc computing tide curves (requires numba)"""
+    from numba import guvectorize
+    return guvectorize(['void(f8, f8, f8[:], f8[:], f8[:], f8[:], f8[:])'], '(),(),(n),(n),(n),(n)->()',
+                       target='parallel', fastmath=True, cache=True)(_height_at)
+
+
+@functools.lru_cache(maxsize=None)
+def _parallel_height_kernel():
+    """Return the parallel ufunc computing tide curves, built on first use
+
+    Returns:
+      The ufunc, or None if numba is not installed or can only use one thread
+    """
+    try:
+        from numba import config
+    except ImportError:
+        return None
+    if config.NUMBA_NUM_THREADS < 2:
+        return None
+    return _build_parallel_height_kernel()
+
+
+def _by_species(x):
+    """Return a read-only copy of the per species array x (one row per species of _J) indexed by species number,
+    with a zero row for the unused species 3"""
+    y = np.zeros((5,) + x.shape[1:], dtype=x.dtype)
+    y[_J] = x
+    y.setflags(write=False)
+    return y
+
+
+@functools.lru_cache(maxsize=4096)
+def _rphi(station_key, T):
+    """Return amplitude and phase of each harmonic species at 00:00 of day number T
+
+    Results are memoized. 24:00 on day T being 00:00 on day T + 1, a sweep over consecutive days computes each day
+    only once.
+
+    Args:
+      station_key (tuple) -- harmonic coefficients A * exp(-iG) of the station, as a flat tuple
+      T (int) -- day number
+
+    Returns:
+      A (R, phi, R_by_species, phi_by_species) tuple of read-only arrays, R and phi having one entry per species of
+      _J, and R_by_species and phi_by_species being indexed by species number (see _by_species)
+    """
+    C = np.array(station_key).reshape(len(_J), 11)
+    R, phi = _rphi_kernel(_ASTRO_0 + _ASTRO_RATES * T, C, _E_IDX)
+    R.setflags(write=False)
+    phi.setflags(write=False)
+    return R, phi, _by_species(R), _by_species(phi)
 
 
 class Tmgpm(object):
 
-    # Load stations data from csv file
-    stations_data = {}
+    # Stations data, loaded from csv file on first use
+    stations_data = None
     filename = os.path.join(
         os.path.abspath(os.path.dirname(__file__)), 'tmgpm.csv')
-    with open(filename) as csvfile:
-        csvreader = csv.DictReader(row for row in csvfile if not row.startswith('#'))
-        for row in csvreader:
-            name = row.pop('NAME')
-            stations_data[name] = row
-
-    # Constants initialization
-    n1 = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, -2, -3, 0, -2, 0, 0, 0, 0, 0, 0], [-2, -3, 0, -4, -4, -3, -1, 0, 0, -2, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [-5, -4, -2, 0, 0, 0, 0, 0, 0, 0, 0]]
-    n2 = [[1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [1, 1, 1, -1, 1, 1, 0, 0, 0, 0, 0], [2, 2, 0, 2, 4, 4, 2, 2, -1, 2, 2], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [4, 4, 2, 0, 0, 0, 0, 0, 0, 0, 0]]
-    n3 = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0], [0, 1, 0, 2, 0, -1, -1, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]]
-    n4 = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, -1, 1, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 1], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]]
-    n5 = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]]
-    n6 = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [1, -1, -1, 1, -1, 1, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]]
+
+    # Bounds of the dates supported by the calculations, as ordinals
+    _MIN_ORD = datetime.date(1900, 3, 1).toordinal()
+    _MAX_ORD = datetime.date(2100, 2, 28).toordinal()
+
+    # Harmonic data computed for each station, keyed by station name
+    _harmonic_cache = {}
+
+    # Constants initialization, indexed by species number (species 3 being all zeros) and kept as class attributes
+    # for backward compatibility, as lists of Python ints so that arithmetic on them cannot overflow like int8
+    n1, n2, n3, n4, n5, n6 = np.insert(_N, 3, 0, axis=1).tolist()
 
     def __init__(self, station_name=None, year=None, month=None, day=None):
         """Initialise a Tmpgpm object
@@ -58,16 +222,23 @@ class Tmgpm(object):
         self.year = None
         self.month = None
         self.day = None
+        self._T0 = None
         self.LO = None
         self.LA = None
         self.UTC = None
         self.Z0 = None
         self.A = None
         self.G = None
+        self._station_key = None
         self.R0 = None
         self.R24 = None
         self.phi0 = None
         self.phi24 = None
+        self._R0 = None
+        self._dR = None
+        self._phi0_rad = None
+        self._omega_rad = None
+        self._species = None
 
         # Set station name or defaults to BREST
         self.set_station(station_name if (station_name is not None) else "BREST")
@@ -80,6 +251,23 @@ class Tmgpm(object):
             day = now.day
         self.set_date(year, month, day)
 
+    @classmethod
+    def _load_stations(cls):
+        """Load stations data from csv file, unless already loaded"""
+        if cls.stations_data is not None:
+            return
+        stations_data = {}
+        with open(cls.filename) as csvfile:
+            csvreader = csv.DictReader(row for row in csvfile if not row.startswith('#'))
+            for row in csvreader:
+                name = row.pop('NAME')
+                # Parse harmonic constituents once, keep position and timezone as strings
+                for key in row:
+                    if key not in ('LA', 'LO', 'UTC'):
+                        row[key] = float(row[key])
+                stations_data[name] = row
+        cls.stations_data = stations_data
+
     @staticmethod
     def get_station_list():
         """Return the list of stations
@@ -87,6 +275,7 @@ class Tmgpm(object):
         Returns:
           A list of strings with the station names
         """
+        Tmgpm._load_stations()
         return list(Tmgpm.stations_data.keys())
 
     def get_station_tz(self):
@@ -106,10 +295,17 @@ class Tmgpm(object):
         Raises:
           ValueError: if the station name is not recognized
         """
+        Tmgpm._load_stations()
         if station_name in Tmgpm.stations_data:
             self.station_name = station_name
             self.station_data = Tmgpm.stations_data[station_name]
-            self._init_harmonic_data()
+            cached = Tmgpm._harmonic_cache.get(station_name)
+            if cached is None:
+                self._init_harmonic_data()
+                Tmgpm._harmonic_cache[station_name] = (self.A, self.G, self.Z0, self.LA, self.LO, self.UTC,
+                                                       self._station_key)
+            else:
+                self.A, self.G, self.Z0, self.LA, self.LO, self.UTC, self._station_key = cached
         else:
             raise ValueError("Station name not recognized")
 
@@ -133,10 +329,12 @@ class Tmgpm(object):
             raise ValueError("The date is not valid")
 
         # Check if the date is comprised between 1/3/1900 and 28/02/2100
-        if datetime.date(1900, 3, 1) < d < datetime.date(2100, 2, 28):
+        ordinal = d.toordinal()
+        if Tmgpm._MIN_ORD < ordinal < Tmgpm._MAX_ORD:
             self.year = year
             self.month = month
             self.day = day
+            self._T0 = ordinal - _EPOCH
             self._init_precalc()
         else:
             raise ValueError("The date is out of bounds. It must be comprised between 1/3/1900 and 28/02/2100")
@@ -145,118 +343,67 @@ class Tmgpm(object):
         """Calculate tide height at the given time
 
         Args:
-          t (float) -- Time expressed as a fractional number (e.g. 9.5 for 09h30m
+          t (float or array_like) -- Time expressed as a fractional number (e.g. 9.5 for 09h30m), or an array of
+            such times to compute a whole tide curve at once
 
         Returns:
-          integer -- Tide height in millimeters
+          integer -- Tide height in millimeters (or a numpy array of integers if t is an array)
         """
-        # Initialize tide height at the station Z0 value
-        # Z0 is stored in cm and the tide calculations are done in millimeters,
-        # hence the * 10
-        height = self.Z0 * 10
-
-        # Calculate tide height
-        for j in range(5):
-            if j != 3:
-                Rj = self.R0[j] + t / 24.0 * (self.R24[j] - self.R0[j])
-                delta_j = self.phi24[j] - self.phi0[j]
-                if delta_j < -180:
-                    delta_j += 360
-                if delta_j > 180:
-                    delta_j -= 360
-                phij = self.phi0[j] + t / 24.0 * (j * 360 + delta_j)
-                height += Rj * cos(radians(phij))
-
-        # and return the value casted as an integer
-        return int(height)
+        # Fast path for a single time: sum the harmonic species with plain floats
+        if isinstance(t, (int, float)) or np.ndim(t) == 0:
+            # Z0 is stored in cm and the tide calculations are done in millimeters,
+            # hence the * 10
+            t = float(t)
+            height = self.Z0 * 10
+            for R0, dR, phi0, omega in self._species:
+                height += (R0 + t * dR) * cos(phi0 + t * omega)
+            return int(height)
+
+        t = np.asarray(t, dtype=np.float64)
+
+        # Sum the harmonic species, their amplitude and phase being interpolated at time t
+        # Long curves are split over several threads when possible
+        kernel = _height_kernel
+        if t.size >= _PARALLEL_MIN_SIZE:
+            kernel = _parallel_height_kernel() or _height_kernel
+        height = kernel(t.ravel(), self.Z0, self._R0, self._dR, self._phi0_rad, self._omega_rad)
+        height = height.reshape(t.shape)
+
+        # and return the values casted as integers
+        return height.astype(int)
 
     def _init_harmonic_data(self):
-        self.A = [[0. for _ in range(11)] for _ in range(5)]
-        self.G = [[0. for _ in range(11)] for _ in range(5)]
-        self.Z0 = float(self.station_data['Z0'])
-        self.A[0][0] = float(self.station_data['ASa'])
-        self.A[1][0] = float(self.station_data['AK1'])
-        self.A[1][1] = float(self.station_data['AO1'])
-        self.A[1][2] = float(self.station_data['AQ1'])
-        self.A[1][3] = -1 / 3.0 * float(self.station_data['AK1'])
-        self.A[1][4] = 1 / 5.3 * float(self.station_data['AO1'])
-        self.A[1][5] = 1 / 7.4 * float(self.station_data['AK1'])
-        self.A[2][0] = float(self.station_data['AM2'])
-        self.A[2][1] = float(self.station_data['AN2'])
-        self.A[2][2] = float(self.station_data['AS2'])
-        self.A[2][3] = 1 / 7.6 * float(self.station_data['AN2'])
-        self.A[2][4] = 1 / 6.3 * float(self.station_data['AN2'])
-        self.A[2][5] = 1 / 5.3 * float(self.station_data['AN2'])
-        self.A[2][6] = -1 / 35.0 * float(self.station_data['AM2'])
-        self.A[2][7] = 1 / 3.7 * float(self.station_data['AS2'])
-        self.A[2][8] = 1 / 17.0 * float(self.station_data['AS2'])
-        self.A[2][9] = -1 / 27.0 * float(self.station_data['AM2'])
-        self.A[2][10] = 1 / 12.0 * float(self.station_data['AS2'])
-        self.A[4][0] = float(self.station_data['AMN4'])
-        self.A[4][1] = float(self.station_data['AM4'])
-        self.A[4][2] = float(self.station_data['AMS4'])
-        self.G[0][0] = float(self.station_data['GSa'])
-        self.G[1][0] = float(self.station_data['GK1'])
-        self.G[1][1] = float(self.station_data['GO1'])
-        self.G[1][2] = float(self.station_data['GQ1'])
-        self.G[1][3] = float(self.station_data['GK1'])
-        self.G[1][4] = float(self.station_data['GO1'])
-        self.G[1][5] = float(self.station_data['GK1'])
-        self.G[2][0] = float(self.station_data['GM2'])
-        self.G[2][1] = float(self.station_data['GN2'])
-        self.G[2][2] = float(self.station_data['GS2'])
-        self.G[2][3] = float(self.station_data['GN2'])
-        self.G[2][4] = float(self.station_data['GN2'])
-        self.G[2][5] = float(self.station_data['GN2'])
-        self.G[2][6] = float(self.station_data['GM2'])
-        self.G[2][7] = float(self.station_data['GS2'])
-        self.G[2][8] = float(self.station_data['GS2']) - 283
-        self.G[2][9] = float(self.station_data['GM2'])
-        self.G[2][10] = float(self.station_data['GS2'])
-        self.G[4][0] = float(self.station_data['GMN4'])
-        self.G[4][1] = float(self.station_data['GM4'])
-        self.G[4][2] = float(self.station_data['GMS4'])
+        # Amplitudes and phases of the station constituents, with a trailing zero for unused slots
+        amplitudes = np.array([self.station_data['A' + c] for c in _CONSTITUENTS] + [0.])
+        phases = np.array([self.station_data['G' + c] for c in _CONSTITUENTS] + [0.])
+        self.Z0 = self.station_data['Z0']
+        A = _A_COEFFS * amplitudes[_SRC]
+        G = phases[_SRC] + _G_OFFSET
+        # Harmonic coefficients A * exp(-iG), hashable to memoize the daily computations
+        self._station_key = tuple((A * np.exp(-1j * np.radians(G))).ravel())
+        # A and G are shared by all the instances for this station, hence read-only
+        self.A = _by_species(A)
+        self.G = _by_species(G)
         self.LA = self.station_data['LA']
         self.LO = self.station_data['LO']
         self.UTC = self.station_data['UTC']
         # TODO: add control mechanism
 
     def _init_precalc(self):
-
-        def compute_R_and_phi_at(t):
-            R = [0., 0., 0., 0., 0.]
-            phi = [0., 0., 0., 0., 0.]
-
-            T = floor(30.6001 * (1 + self.month + 12 * floor(1 / (self.month + 1.0) + 0.7))) + floor(
-                365.25 * (self.year - floor(1 / (self.month + 1.0) + 0.7))) + self.day + t / 24 - 723258
-            h = 279.82 + 0.98564734 * T
-            s = 78.16 + 13.17639673 * T
-            p = 349.5 + 0.11140408 * T
-            N = 208.1 + 0.05295392 * T
-            p1 = 282.6 + 0.000047069 * T
-            D = 90
-
-            for j in range(5):
-                if j != 3:
-                    Xj = 0
-                    Yj = 0
-                    for i in range(11):
-                        Vij = 15 * j * t + Tmgpm.n1[j][i] * s + Tmgpm.n2[j][i] * h + Tmgpm.n3[j][i] * p + \
-                            Tmgpm.n4[j][i] * N + Tmgpm.n5[j][i] * p1 + Tmgpm.n6[j][i] * D
-                        Xj += self.A[j][i] * cos(radians(Vij - self.G[j][i]))
-                        Yj += self.A[j][i] * sin(radians(Vij - self.G[j][i]))
-
-                    R[j] = sqrt(power(Xj, 2) + power(Yj, 2))
-                    if R[j] == 0:
-                        phi[j] = 90
-                    else:
-                        phi[j] = degrees(
-                            acos(Xj / R[j])) * sign(degrees(asin(Yj / R[j])))
-
-            return R, phi
-
-        self.R0, self.phi0 = compute_R_and_phi_at(0)
-        self.R24, self.phi24 = compute_R_and_phi_at(24)
+        R0, phi0, self.R0, self.phi0 = _rphi(self._station_key, self._T0)
+        R24, phi24, self.R24, self.phi24 = _rphi(self._station_key, self._T0 + 1)
+
+        # Amplitude at 00:00 and hourly rate of change of amplitude and phase for each harmonic species of _J,
+        # the phase drift over the day being wrapped into [-180, 180)
+        delta = np.remainder(phi24 - phi0 + 180, 360) - 180
+        self._R0 = R0
+        self._dR = (R24 - R0) / 24.0
+        self._phi0_rad = np.radians(phi0)
+        self._omega_rad = np.radians(_J * 360 + delta) / 24.0
+
+        # Same values as plain floats, grouped by species, for the single time path of height()
+        self._species = tuple(zip(self._R0.tolist(), self._dR.tolist(), self._phi0_rad.tolist(),
+                                  self._omega_rad.tolist()))
 
     def __repr__(self):
         """Return a string containing a printable representation of a Tmgpm object"""
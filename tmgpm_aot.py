@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ahead-of-time compilation of the tmgpm kernels with Numba
+
+Run this script once to build the tmgpm_native extension module next to tmgpm.py. When it is present, tmgpm uses
+it instead of JIT compiling its kernels on first call, which avoids the compilation delay in short-lived processes.
+"""
+
+import os
+
+from numba.pycc import CC
+
+import tmgpm
+
+cc = CC('tmgpm_native')
+cc.output_dir = os.path.abspath(os.path.dirname(__file__))
+
+cc.export('compute_rphi', 'UniTuple(f8[:], 2)(f8[:], c16[:, :], intp[:])')(tmgpm._compute_R_phi)
+cc.export('height_curve', 'f8[:](f8[:], f8, f8[:], f8[:], f8[:], f8[:])')(tmgpm._height_curve)
+
+if __name__ == '__main__':
+    cc.compile()